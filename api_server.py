@@ -7,40 +7,104 @@ Provides JSON endpoints for the React dashboard
 import os
 import json
 import io
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
 # Configuration
 DATA_PATH = "data/All_Diets.csv"
+# Columnar copy of the CSV, regenerated whenever the CSV is newer
+PARQUET_PATH = "data/All_Diets.parquet"
+DATA_COLUMNS = ['Recipe_name', 'Diet_type', 'Cuisine_type', 'Protein(g)', 'Carbs(g)', 'Fat(g)']
+
+# In-process cache of the processed dataset and results derived from it.
+# Keyed on the CSV modification time so an updated file is picked up.
+_DATA_CACHE = {'mtime': None, 'df': None, 'derived': {}}
+
+# Responses only change with the dataset: let the browser/CDN revalidate via ETag
+CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=300'
+# Recipes serialized per chunk in /api/recipes
+RECIPES_CHUNK_ROWS = 1000
+# Random generator for the scatter plot sample (fresh entropy per process)
+_RNG = np.random.default_rng()
 
 def load_and_process_data():
-    """Load and process the diet dataset"""
+    """
+    Load and process the diet dataset (re-read only when the CSV changes)
+
+    The cached DataFrame itself is returned, not a copy: callers must treat
+    it as read-only (pandas methods that return new frames are fine).
+    """
     try:
-        # Load CSV file
-        df = pd.read_csv(DATA_PATH)
+        mtime = os.stat(DATA_PATH).st_mtime_ns
+        if _DATA_CACHE['mtime'] == mtime:
+            return _DATA_CACHE['df']
+
+        df = read_dataset()
 
         # Handle missing data
         df.fillna(df.mean(numeric_only=True), inplace=True)
 
+        _DATA_CACHE.update(mtime=mtime, df=df, derived={})
         return df
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
 
+def read_dataset():
+    """Read the columns the API uses, from the Parquet copy when it is up to date"""
+    parquet_path = Path(PARQUET_PATH)
+    try:
+        if parquet_path.exists() and parquet_path.stat().st_mtime_ns >= os.stat(DATA_PATH).st_mtime_ns:
+            return pd.read_parquet(PARQUET_PATH, columns=DATA_COLUMNS)
+    except Exception as e:
+        # No Parquet engine (pyarrow) installed, or a corrupt/truncated copy
+        # (ArrowInvalid): the CSV below is the source of truth and replaces it
+        print(f"Parquet cache unreadable ({e}), reading CSV")
+
+    # Missing, stale or unreadable: parse the CSV once and write the Parquet copy
+    df = pd.read_csv(DATA_PATH)
+
+    # Written to a temp file and renamed into place: an interrupted write, or
+    # another Gunicorn worker converting at the same time, never leaves a
+    # half-written file at PARQUET_PATH
+    tmp_path = parquet_path.with_name(f"{parquet_path.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, parquet_path)
+        print(f"Converted {DATA_PATH} to {PARQUET_PATH}")
+    except Exception as e:
+        # No Parquet engine (pyarrow) installed or data/ not writable
+        print(f"Parquet cache unavailable ({e}), using CSV only")
+        tmp_path.unlink(missing_ok=True)
+    return df[DATA_COLUMNS]
+
+def get_cached_result(name, compute, df):
+    """Return compute(df), calculated once per version of the cached dataset"""
+    derived = _DATA_CACHE['derived']
+    if name not in derived:
+        derived[name] = compute(df)
+    return derived[name]
+
 def calculate_macronutrient_averages(df):
     """Calculate average macronutrients by diet type"""
-    avg_macros = df.groupby('Diet_type')[['Protein(g)', 'Carbs(g)', 'Fat(g)']].mean()
+    avg_macros = df.groupby('Diet_type')[['Protein(g)', 'Carbs(g)', 'Fat(g)']].mean().round(2)
     return avg_macros.reset_index().to_dict(orient='records')
 
-def get_diet_distribution(df):
+def get_diet_distribution(df, diet_counts=None):
     """Get recipe count by diet type for pie chart"""
-    diet_counts = df['Diet_type'].value_counts()
+    if diet_counts is None:
+        diet_counts = df['Diet_type'].value_counts()
     return {
         'labels': diet_counts.index.tolist(),
         'values': diet_counts.values.tolist()
@@ -49,17 +113,19 @@ def get_diet_distribution(df):
 def get_protein_carbs_relationship(df):
     """Get protein vs carbs data for scatter plot"""
     # Sample data for performance (take 100 random recipes)
-    sample_df = df.sample(min(100, len(df)))
+    # Draw row positions directly instead of going through DataFrame.sample()
+    idx = _RNG.choice(len(df), size=min(100, len(df)), replace=False)
+    sample_df = df.iloc[idx]
 
+    # One groupby pass (in order of first appearance), then zip plain column
+    # lists instead of building a pandas Series per row with iterrows()
     scatter_data = []
-    for diet_type in sample_df['Diet_type'].unique():
-        diet_data = sample_df[sample_df['Diet_type'] == diet_type]
+    for diet_type, diet_data in sample_df.groupby('Diet_type', sort=False):
+        carbs = diet_data['Carbs(g)'].tolist()
+        protein = diet_data['Protein(g)'].tolist()
         scatter_data.append({
             'diet_type': diet_type,
-            'data': [
-                {'x': row['Carbs(g)'], 'y': row['Protein(g)']}
-                for _, row in diet_data.iterrows()
-            ]
+            'data': [{'x': x, 'y': y} for x, y in zip(carbs, protein)]
         })
 
     return scatter_data
@@ -70,11 +136,71 @@ def get_correlation_heatmap(df):
     corr_cols = ['Protein(g)', 'Carbs(g)', 'Fat(g)']
     corr_matrix = df[corr_cols].corr()
 
+    # 4 decimals is plenty for a heatmap and keeps the JSON numbers short
     return {
         'labels': corr_cols,
-        'data': corr_matrix.values.tolist()
+        'data': np.round(corr_matrix.to_numpy(), 4).tolist()
     }
 
+def to_json_bytes(data):
+    """Serialize data to UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('ascii')  # ensure_ascii default: already ASCII
+
+def build_recipes_json(df):
+    """
+    Serialize the /api/recipes body: all recipes sorted by protein (highest first)
+
+    Returns the JSON document pre-encoded as a list of byte chunks
+    (RECIPES_CHUNK_ROWS recipes each), which the response writes one after
+    another. Only one chunk's record dicts exist at a time and the chunks are
+    never joined into one body, but the whole encoded document is held in
+    memory: the list is cached per dataset version (see get_cached_result).
+    """
+    all_recipes = df.sort_values('Protein(g)', ascending=False)[
+        ['Recipe_name', 'Diet_type', 'Cuisine_type', 'Protein(g)', 'Carbs(g)', 'Fat(g)']
+    ]
+
+    chunks = [b'{"recipes":[']
+    for start in range(0, len(all_recipes), RECIPES_CHUNK_ROWS):
+        records = all_recipes.iloc[start:start + RECIPES_CHUNK_ROWS].to_dict(orient='records')
+        # Strip the list brackets: each chunk continues the same JSON array
+        chunk = to_json_bytes(records)[1:-1]
+        chunks.append(chunk if start == 0 else b',' + chunk)
+    chunks.append(b'],"total":%d}' % len(df))
+    return chunks
+
+def conditional_response(name, build):
+    """
+    Return build() tagged with a weak ETag of the dataset version, or
+    304 Not Modified (without building the body) if the client's copy is current
+    """
+    etag = f"{_DATA_CACHE['mtime']}-{name}"
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = build()
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+def summarize_dataset(df):
+    """Compute the deterministic insights, sharing passes over the data"""
+    # One value_counts pass gives both the distribution and the diet type count
+    diet_counts = df['Diet_type'].value_counts()
+    return {
+        'total_recipes': int(len(df)),
+        'diet_types': int(diet_counts.size),
+        'average_macronutrients': calculate_macronutrient_averages(df),
+        'diet_distribution': get_diet_distribution(df, diet_counts),
+        'correlation_heatmap': get_correlation_heatmap(df)
+    }
+
+def build_summary_json(df):
+    """Serialize the deterministic /api/insights fields (a JSON object)"""
+    return to_json_bytes(summarize_dataset(df))
+
 @app.route('/api/insights', methods=['GET'])
 def get_insights():
     """Main endpoint that returns all nutritional insights"""
@@ -84,18 +210,20 @@ def get_insights():
         if df is None:
             return jsonify({'error': 'Failed to load dataset'}), 500
 
-        # Calculate all insights
-        response = {
-            'total_recipes': int(len(df)),
-            'diet_types': int(df['Diet_type'].nunique()),
-            'average_macronutrients': calculate_macronutrient_averages(df),
-            'diet_distribution': get_diet_distribution(df),
-            'protein_carbs_scatter': get_protein_carbs_relationship(df),
-            'correlation_heatmap': get_correlation_heatmap(df),
-            'processing_status': 'success'
-        }
+        def build():
+            # Calculate all insights
+            # Deterministic in df: computed and encoded once per dataset version
+            summary_json = get_cached_result('summary_json', build_summary_json, df)
+            # Random sample: fresh whenever the body is rebuilt, spliced into
+            # the encoded summary object together with the constant status
+            body = (
+                summary_json[:-1]
+                + b',"protein_carbs_scatter":' + to_json_bytes(get_protein_carbs_relationship(df))
+                + b',"processing_status":"success"}'
+            )
+            return app.response_class(body, mimetype='application/json')
 
-        return jsonify(response)
+        return conditional_response('insights', build)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -109,15 +237,11 @@ def get_recipes():
         if df is None:
             return jsonify({'error': 'Failed to load dataset'}), 500
 
-        # Get all recipes sorted by protein (highest first)
-        all_recipes = df.sort_values('Protein(g)', ascending=False)[
-            ['Recipe_name', 'Diet_type', 'Cuisine_type', 'Protein(g)', 'Carbs(g)', 'Fat(g)']
-        ].to_dict(orient='records')
-
-        return jsonify({
-            'recipes': all_recipes,
-            'total': len(df)
-        })
+        # Sorted and serialized once per dataset version, then written chunk by chunk
+        return conditional_response('recipes', lambda: app.response_class(
+            get_cached_result('recipes_json', build_recipes_json, df),
+            mimetype='application/json'
+        ))
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -144,6 +268,9 @@ if __name__ == '__main__':
     if not Path(DATA_PATH).exists():
         print(f"WARNING: Dataset not found at {DATA_PATH}")
         print("Please ensure All_Diets.csv is in the data/ folder")
+    else:
+        # Warm the dataset cache (and Parquet copy) before serving
+        load_and_process_data()
 
     print("Starting Flask API Server")
     print("API running on http://localhost:5000")
@@ -2,6 +2,7 @@
 Azure Function: Nutritional Insights API with Redis Caching
 Four main endpoints (all using pre-computed results from Redis):
 1. /api/get-charts - Get visualizations (from cache)
+   /api/get-chart-image - Get a single visualization as image/png (from cache)
 2. /api/get-insights - Get analysis results (from cache)
 3. /api/get-recipes - Get recipes with filters and pagination (from cache)
 4. /api/health - Health check endpoint
@@ -13,13 +14,17 @@ PHASE 3 OPTIMIZATION:
 """
 
 import azure.functions as func
-import json
 import time
+import zlib
 import logging
-from datetime import datetime, timezone
 
 # Import shared modules
-from shared.redis_cache import RedisCache
+# Only lightweight ones: shared.chart_generator (matplotlib/seaborn/pandas,
+# ~0.8s) and shared.processing are BlobTrigger-only, and importing them here
+# would add that to every API cold start, health probes included
+from shared.redis_cache import get_redis_cache
+from shared.search_index import search_recipes
+from shared import json_utils
 
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
@@ -28,6 +33,7 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
     Supported routes:
     - GET /api/health → Health check endpoint
     - GET /api/get-charts → Returns charts from cache
+    - GET /api/get-chart-image?name=<chart> → Returns one chart as a PNG image
     - GET /api/get-insights → Returns insights from cache
     - GET /api/get-recipes → Returns recipes from cache (with filters & pagination)
     """
@@ -37,24 +43,15 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
     
     logging.info(f"Request received for action: {action}")
     
-    try:
-        if action == 'health':
-            return get_health(req)
+    handler = ROUTES.get(action)
+    if handler is None:
+        return error_response(
+            f"Unknown action: {action}. Valid actions: {', '.join(ROUTES)}",
+            404
+        )
     
-        elif action == 'get-charts':
-            return get_charts(req)
-        
-        elif action == 'get-insights':
-            return get_insights(req)
-        
-        elif action == 'get-recipes':
-            return get_recipes(req)
-        
-        else:
-            return error_response(
-                f"Unknown action: {action}. Valid actions: health, get-charts, get-insights, get-recipes",
-                404
-            )
+    try:
+        return handler(req)
     
     except Exception as e:
         logging.error(f"Error: {str(e)}", exc_info=True)
@@ -67,20 +64,20 @@ def get_health(req: func.HttpRequest) -> func.HttpResponse:
     Checks Redis connectivity and cache status
     """
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     logging.info("Health check requested")
     
     try:
         # Check Redis connectivity
         logging.info("  - Checking Redis connection...")
         try:
-            redis = RedisCache()
+            redis = get_redis_cache()
+            redis.ping()
             redis_status = "connected"
             
             # Check if data has been processed
-            metadata_json = redis.get("metadata")
-            if metadata_json:
-                metadata = json.loads(metadata_json)
+            metadata = redis.get_json("metadata")
+            if metadata:
                 cache_info = {
                     "last_processed": metadata.get("last_processed"),
                     "total_recipes": metadata.get("total_recipes"),
@@ -96,8 +93,8 @@ def get_health(req: func.HttpRequest) -> func.HttpResponse:
             logging.warning(f"    ✗ Redis error: {str(e)}")
         
         # Build response
-        execution_time = time.time() - start_time
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        execution_time = time.perf_counter() - start_time
+        timestamp = utc_now_iso()
         
         response_data = {
             "status": "healthy" if redis_status == "connected" else "degraded",
@@ -115,7 +112,7 @@ def get_health(req: func.HttpRequest) -> func.HttpResponse:
         logging.info(f"Health check complete. Status: {response_data['status']}")
         
         return func.HttpResponse(
-            json.dumps(response_data, ensure_ascii=False),
+            json_utils.dumps(response_data),
             status_code=status_code,
             mimetype="application/json; charset=utf-8",
         )
@@ -127,12 +124,12 @@ def get_health(req: func.HttpRequest) -> func.HttpResponse:
             "status": "unhealthy",
             "service": "Nutritional Insights API",
             "version": "2.0.0-redis",
-            "timestamp": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            "timestamp": utc_now_iso(),
             "error": str(e)
         }
         
         return func.HttpResponse(
-            json.dumps(error_data, ensure_ascii=False),
+            json_utils.dumps(error_data),
             status_code=503,
             mimetype="application/json; charset=utf-8",
         )
@@ -143,59 +140,71 @@ def get_charts(req: func.HttpRequest) -> func.HttpResponse:
     Get pre-generated charts from Redis cache
     NO data cleaning, NO calculations - just read from cache!
     
-    Returns: Base64 encoded PNG images
+    Returns: Base64 data URIs of the charts, lossless WebP
+             ("data:image/webp;base64,...") or PNG when Pillow lacks WebP support
     """
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     logging.info("Getting charts from Redis cache...")
     
     try:
-        redis = RedisCache()
-        
-        # Read pre-generated charts from Redis
-        logging.info("  - Reading bar chart from cache...")
-        bar_chart = redis.get("charts:bar_chart")
-        
-        logging.info("  - Reading heatmap from cache...")
-        heatmap = redis.get("charts:heatmap")
-        
-        logging.info("  - Reading scatter plot from cache...")
-        scatter_plot = redis.get("charts:scatter_plot")
-        
-        # Check if all charts are available
-        if not all([bar_chart, heatmap, scatter_plot]):
-            logging.warning("Charts not found in cache !")
-            return error_response(
-                "Charts not ready. Please wait for data processing to complete. "
-                "Upload All_Diets.csv to trigger processing.",
-                503
-            )
-        
-        # Get metadata for additional info
-        metadata_json = redis.get("metadata")
-        metadata = json.loads(metadata_json) if metadata_json else {}
-        
-        execution_time = time.time() - start_time
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        redis = get_redis_cache()
+        
+        # Same dataset as the previous request on this instance: reuse its charts
+        version = redis.get("metadata:last_processed")
+        cached = get_memoized("charts", version)
+        if cached:
+            charts, trigger_performance, metadata = cached
+            logging.info("  - Charts reused from instance memory (dataset unchanged)")
+        else:
+            # Read pre-generated charts (stored as complete data URIs) and metadata
+            # from Redis in one round-trip
+            logging.info("  - Reading charts and metadata from cache...")
+            bar_chart, heatmap, scatter_plot, metadata_json = redis.mget([
+                "charts:bar_chart",
+                "charts:heatmap",
+                "charts:scatter_plot",
+                "metadata"
+            ])
+            
+            # Check if all charts are available
+            if not all([bar_chart, heatmap, scatter_plot]):
+                logging.warning("Charts not found in cache !")
+                return error_response(
+                    "Charts not ready. Please wait for data processing to complete. "
+                    "Upload All_Diets.csv to trigger processing.",
+                    503
+                )
+            
+            # Metadata for additional info
+            metadata = json_utils.loads(metadata_json) if metadata_json else {}
+            
+            # Encoded once, spliced into every response until the next BlobTrigger run
+            charts = json_utils.Fragment(json_utils.dumps({
+                "bar_chart": bar_chart,
+                "heatmap": heatmap,
+                "scatter_plot": scatter_plot
+            }))
+            trigger_performance = encode_trigger_performance(metadata)
+            memoize("charts", version, (charts, trigger_performance, metadata))
+        
+        etag = make_etag(metadata, "charts")
+        if etag_matches(req, etag):
+            return not_modified_response(etag)
+        
+        execution_time = time.perf_counter() - start_time
+        timestamp = utc_now_iso()
         
         response_data = {
             "status": "success",
-            "data": {
-                "bar_chart": f"data:image/png;base64,{bar_chart}",
-                "heatmap": f"data:image/png;base64,{heatmap}",
-                "scatter_plot": f"data:image/png;base64,{scatter_plot}"
-            },
+            "data": charts,
             "api_performance": {
                 "api_response_time_sec": round(execution_time, 2),
                 "timestamp": timestamp,
                 "cached": True,
                 "operations": "Read from Redis cache only"
             },
-            "blob_trigger_performance": {
-                "last_processed": metadata.get("last_processed", "Unknown"),
-                "step_times": metadata.get("step_times", {}),
-                "total_recipes_processed": metadata.get("total_recipes", 0)
-            },
+            "blob_trigger_performance": trigger_performance,
             "performance_comparison": {
                 "api_vs_blob_speedup": f"{round(metadata.get('step_times', {}).get('total_processing_sec', 1) / max(execution_time, 0.01), 1)}x faster",
                 "note": "API reads pre-computed results from cache, BlobTrigger does all heavy processing"
@@ -209,70 +218,126 @@ def get_charts(req: func.HttpRequest) -> func.HttpResponse:
         logging.info(f"  ✓  NO calculations performed")
         logging.info(f"  ✓  All data read from Redis cache")
         
-        return success_response(response_data)
+        return success_response(response_data, etag)
         
     except Exception as e:
         logging.error(f"✗ Error retrieving charts: {str(e)}", exc_info=True)
         return error_response(f"Failed to retrieve charts: {str(e)}", 500)
 
 
-# ===== HANDLER 2: Get Insights (FROM CACHE) =====
-def get_insights(req: func.HttpRequest) -> func.HttpResponse:
+# ===== HANDLER 1b: Get Chart Image (FROM CACHE) =====
+CHART_NAMES = ("bar_chart", "heatmap", "scatter_plot")
+
+def get_chart_image(req: func.HttpRequest) -> func.HttpResponse:
     """
-    Get pre-calculated insights from Redis cache
-    NO data cleaning, NO calculations - just read from cache!
+    Get one pre-generated chart from Redis cache as a PNG image
+    The raw PNG is stored by BlobTrigger, so there is no Base64 encoding and
+    no JSON wrapping; browsers cache it like any other image.
     
-    Returns: Analysis data, statistics, findings
+    Query parameters:
+      - name: bar_chart | heatmap | scatter_plot
+    
+    Returns: image/png body
     """
     
-    start_time = time.time()
-    logging.info("Getting insights from Redis cache...")
+    name = req.params.get('name', '')
+    logging.info(f"Getting chart image '{name}' from Redis cache...")
+    
+    if name not in CHART_NAMES:
+        return error_response(
+            f"Unknown chart: {name}. Valid charts: {', '.join(CHART_NAMES)}",
+            404
+        )
     
     try:
-        redis = RedisCache()
+        redis = get_redis_cache()
+        png_bytes = redis.get_bytes(f"charts:{name}:png")
         
-        # Read pre-calculated insights from Redis
-        logging.info("  - Reading insights from cache...")
-        insights_json = redis.get("insights:summary")
-        
-        logging.info("  - Reading metadata from cache...")
-        metadata_json = redis.get("metadata")
-        
-        if not insights_json:
-            logging.warning("Insights not found in cache !")
+        if not png_bytes:
+            logging.warning(f"Chart image '{name}' not found in cache !")
             return error_response(
-                "Insights not ready. Please wait for data processing to complete. "
+                "Charts not ready. Please wait for data processing to complete. "
                 "Upload All_Diets.csv to trigger processing.",
                 503
             )
         
-        insights = json.loads(insights_json)
-        metadata = json.loads(metadata_json) if metadata_json else {}
-        
-        execution_time = time.time() - start_time
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        return func.HttpResponse(
+            body=png_bytes,
+            status_code=200,
+            mimetype="image/png",
+            headers={"Cache-Control": "public, max-age=300"}
+        )
         
-        response_data = {
-            "status": "success",
-            "data": {
-                "insights": insights,
+    except Exception as e:
+        logging.error(f"✗ Error retrieving chart image: {str(e)}", exc_info=True)
+        return error_response(f"Failed to retrieve chart image: {str(e)}", 500)
+
+
+# ===== HANDLER 2: Get Insights (FROM CACHE) =====
+def get_insights(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get pre-calculated insights from Redis cache
+    NO data cleaning, NO calculations - just read from cache!
+    
+    Returns: Analysis data, statistics, findings
+    """
+    
+    start_time = time.perf_counter()
+    logging.info("Getting insights from Redis cache...")
+    
+    try:
+        redis = get_redis_cache()
+        
+        # Same dataset as the previous request on this instance: reuse its insights
+        version = redis.get("metadata:last_processed")
+        cached = get_memoized("insights", version)
+        if cached:
+            insights_data, trigger_performance, metadata = cached
+            logging.info("  - Insights reused from instance memory (dataset unchanged)")
+        else:
+            # Read pre-calculated insights and metadata from Redis in one round-trip
+            logging.info("  - Reading insights and metadata from cache...")
+            insights_json, metadata_json = redis.mget(["insights:summary", "metadata"])
+            
+            if not insights_json:
+                logging.warning("Insights not found in cache !")
+                return error_response(
+                    "Insights not ready. Please wait for data processing to complete. "
+                    "Upload All_Diets.csv to trigger processing.",
+                    503
+                )
+            
+            metadata = json_utils.loads(metadata_json) if metadata_json else {}
+            
+            # Encoded once, spliced into every response until the next BlobTrigger run
+            insights_data = json_utils.Fragment(json_utils.dumps({
+                "insights": json_utils.Fragment(insights_json),
                 "data_stats": {
                     "total_recipes": metadata.get("total_recipes", 0),
                     "diet_types": metadata.get("diet_types_count", 0),
                     "cuisines": metadata.get("cuisines_count", 0)
                 }
-            },
+            }))
+            trigger_performance = encode_trigger_performance(metadata)
+            memoize("insights", version, (insights_data, trigger_performance, metadata))
+        
+        etag = make_etag(metadata, "insights")
+        if etag_matches(req, etag):
+            return not_modified_response(etag)
+        
+        execution_time = time.perf_counter() - start_time
+        timestamp = utc_now_iso()
+        
+        response_data = {
+            "status": "success",
+            "data": insights_data,
             "api_performance": {
                 "api_response_time_sec": round(execution_time, 2),
                 "timestamp": timestamp,
                 "cached": True,
                 "operations": "Read from Redis cache only"
             },
-            "blob_trigger_performance": {
-                "last_processed": metadata.get("last_processed", "Unknown"),
-                "step_times": metadata.get("step_times", {}),
-                "total_recipes_processed": metadata.get("total_recipes", 0)
-            },
+            "blob_trigger_performance": trigger_performance,
             "performance_comparison": {
                 "api_vs_blob_speedup": f"{round(metadata.get('step_times', {}).get('total_processing_sec', 1) / max(execution_time, 0.01), 1)}x faster",
                 "note": "API reads pre-computed results from cache, BlobTrigger does all heavy processing"
@@ -285,7 +350,7 @@ def get_insights(req: func.HttpRequest) -> func.HttpResponse:
         logging.info(f"  ✓  NO calculations performed")
         logging.info(f"  ✓  All data read from Redis cache")
         
-        return success_response(response_data)
+        return success_response(response_data, etag)
         
     except Exception as e:
         logging.error(f"✗ Error retrieving insights: {str(e)}", exc_info=True)
@@ -306,11 +371,11 @@ def get_recipes(req: func.HttpRequest) -> func.HttpResponse:
       - page_size: Items per page (default: 20)
     """
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     logging.info("Getting recipes from Redis cache...")
     
     try:
-        redis = RedisCache()
+        redis = get_redis_cache()
         
         # Parse query parameters
         diet_type = req.params.get('diet_type')
@@ -340,72 +405,124 @@ def get_recipes(req: func.HttpRequest) -> func.HttpResponse:
         logging.info(f"  - Fetching: {filter_info}")
         logging.info(f"  - Cache key: {cache_key}")
         
-        # Read from Redis cache
-        recipes_json = redis.get(cache_key)
-        
-        if not recipes_json:
-            # Cache miss - check if it's because data hasn't been processed
-            all_recipes = redis.get("recipes:all")
-            if not all_recipes:
-                logging.warning("✗ No recipes in cache - data not processed yet!")
-                return error_response(
-                    "Recipes not ready. Upload All_Diets.csv to trigger processing.",
-                    503
-                )
+        # List length, metadata and the pre-sliced page come back in one MGET
+        cached_count, metadata_json, recipes_raw = redis.mget([
+            f"{cache_key}:count",
+            "metadata",
+            f"{cache_key}:page:{page}:{page_size}"
+        ], raw=True)
+        metadata = json_utils.loads(metadata_json) if metadata_json else {}
+        
+        # Client already has this page of the current dataset: skip the search and encoding
+        # (only once the list and metadata exist: a dataset not processed yet
+        # is never "not modified", the 503/404 below answers for it)
+        etag = None
+        if cached_count and metadata_json:
+            etag = make_etag(metadata, cache_key, keyword, page, page_size)
+            if etag_matches(req, etag):
+                return not_modified_response(etag)
+        
+        # ===== FAST PATH: serve the page straight from cache =====
+        # The ":count" key gives the total without parsing the list. The page
+        # pre-sliced by BlobTrigger (standard page sizes only) is used when present,
+        # or the cached list itself when it all fits on page 1. Either way the
+        # cached JSON is spliced into the response as-is (no decode → parse → re-encode)
+        paginated_recipes = None
+        if cached_count and not keyword and page >= 1:
+            total_count = int(cached_count)
+            if page_size >= 1 and (page - 1) * page_size >= total_count:
+                # Past the end of the list: never trust a page key for it
+                # (one left over from a larger dataset would still be there)
+                recipes_raw = b"[]"
+            elif not recipes_raw and page == 1 and page_size >= total_count:
+                recipes_raw = redis.get_bytes(cache_key)
+            elif not recipes_raw and page_size >= 1:
+                # Non-standard page size: assemble it from the smallest pre-sliced pages
+                recipes_raw = read_page_window(redis, cache_key, page, page_size, total_count)
+            
+            if recipes_raw:
+                paginated_recipes = json_utils.Fragment(recipes_raw)
+                logging.info(f"  ✓ Page {page} of {total_count} cached recipes served without parsing")
+        
+        # ===== KEYWORD SEARCH via inverted index =====
+        # Only matching recipe IDs are collected, then just the page is fetched
+        elif cached_count and keyword and page >= 1:
+            search_result = search_recipes(redis, keyword, cache_key, page, page_size)
+            if search_result is not None:
+                total_count, page_json = search_result
+                logging.info(f"Keyword search '{keyword}' (index): {total_count} recipes")
+                
+                if total_count == 0:
+                    logging.warning(f"✗ No recipes found matching keyword '{keyword}'")
+                    return error_response(
+                        f"No recipes found matching keyword '{keyword}' in the selected category.",
+                        404
+                    )
+                
+                paginated_recipes = json_utils.Fragment(page_json)
+        
+        if paginated_recipes is None:
+            # Read from Redis cache
+            recipes_json = redis.get(cache_key)
             
-            # No recipes found for given filters
-            if diet_type and cuisine_type:
-                logging.warning(f"✗ No recipes found for {diet_type} + {cuisine_type}")
+            if not recipes_json:
+                # Cache miss - check if it's because data hasn't been processed
+                if not redis.exists("recipes:all"):
+                    logging.warning("✗ No recipes in cache - data not processed yet!")
+                    return error_response(
+                        "Recipes not ready. Upload All_Diets.csv to trigger processing.",
+                        503
+                    )
+                
+                # No recipes found for given filters
+                if diet_type and cuisine_type:
+                    logging.warning(f"✗ No recipes found for {diet_type} + {cuisine_type}")
+                    return error_response(
+                        f"No recipes found for the combination: {diet_type} + {cuisine_type}.",
+                        404
+                    )
+                
+                # Invalid filter value
+                logging.warning(f"✗ Cache miss for '{cache_key}' - invalid filter!")
                 return error_response(
-                    f"No recipes found for the combination: {diet_type} + {cuisine_type}.",
+                    f"No recipes found for {filter_info}. Check if the value is correct.",
                     404
                 )
             
-            # Invalid filter value
-            logging.warning(f"✗ Cache miss for '{cache_key}' - invalid filter!")
-            return error_response(
-                f"No recipes found for {filter_info}. Check if the value is correct.",
-                404
-            )
-        
-        recipes_list = json.loads(recipes_json)
-        logging.info(f"  ✓ Found {len(recipes_list)} recipes in cache")
-        
-        # ===== KEYWORD SEARCH (if provided) =====
-        if keyword:
-            keyword_lower = keyword.lower()
-            original_count = len(recipes_list)
+            recipes_list = json_utils.loads(recipes_json)
+            logging.info(f"  ✓ Found {len(recipes_list)} recipes in cache")
             
-            # Filter recipes by keyword in recipe name
-            recipes_list = [
-                recipe for recipe in recipes_list
-                if keyword_lower in recipe.get('recipe_name', '').lower()
-            ]
+            # ===== KEYWORD SEARCH (if provided) =====
+            if keyword:
+                keyword_lower = keyword.lower()
+                original_count = len(recipes_list)
+                
+                # Filter recipes by keyword in recipe name
+                recipes_list = [
+                    recipe for recipe in recipes_list
+                    if keyword_lower in recipe.get('recipe_name', '').lower()
+                ]
+                
+                filtered_count = len(recipes_list)
+                logging.info(f"Keyword search '{keyword}': {original_count} → {filtered_count} recipes")
+                
+                if filtered_count == 0:
+                    logging.warning(f"✗ No recipes found matching keyword '{keyword}'")
+                    return error_response(
+                        f"No recipes found matching keyword '{keyword}' in the selected category.",
+                        404
+                    )
             
-            filtered_count = len(recipes_list)
-            logging.info(f"Keyword search '{keyword}': {original_count} → {filtered_count} recipes")
+            # Implement pagination
+            total_count = len(recipes_list)
+            start_idx = (page - 1) * page_size
+            end_idx = start_idx + page_size
+            paginated_recipes = recipes_list[start_idx:end_idx]
             
-            if filtered_count == 0:
-                logging.warning(f"✗ No recipes found matching keyword '{keyword}'")
-                return error_response(
-                    f"No recipes found matching keyword '{keyword}' in the selected category.",
-                    404
-                )
-        
-        # Implement pagination
-        total_count = len(recipes_list)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_recipes = recipes_list[start_idx:end_idx]
-        
-        logging.info(f"  - Pagination: page {page}, showing {len(paginated_recipes)} items")
-        
-        # Get metadata
-        metadata_json = redis.get("metadata")
-        metadata = json.loads(metadata_json) if metadata_json else {}
+            logging.info(f"  - Pagination: page {page}, showing {len(paginated_recipes)} items")
         
-        execution_time = time.time() - start_time
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        execution_time = time.perf_counter() - start_time
+        timestamp = utc_now_iso()
         
         response_data = {
             "status": "success",
@@ -416,7 +533,7 @@ def get_recipes(req: func.HttpRequest) -> func.HttpResponse:
                     "page_size": page_size,
                     "total_count": total_count,
                     "total_pages": (total_count + page_size - 1) // page_size,
-                    "has_next": end_idx < total_count,
+                    "has_next": page * page_size < total_count,
                     "has_prev": page > 1
                 },
                 "filter_applied": {
@@ -452,31 +569,157 @@ def get_recipes(req: func.HttpRequest) -> func.HttpResponse:
             logging.info(f"Keyword search performed on cached data")
         logging.info(f"  ✓  All data read from Redis cache")
         
-        return success_response(response_data)
+        return success_response(response_data, etag)
         
     except Exception as e:
         logging.error(f"✗ Error retrieving recipes: {str(e)}", exc_info=True)
         return error_response(f"Failed to retrieve recipes: {str(e)}", 500)
 
 
+# Smallest page size BlobTrigger pre-slices (RECIPE_PAGE_SIZES there)
+BASE_PAGE_SIZE = 10
+
+
+def read_page_window(redis, cache_key, page, page_size, total_count):
+    """
+    Build one page of any size from the pre-sliced BASE_PAGE_SIZE pages,
+    so only the few small pages covering it are fetched and parsed
+    
+    Args:
+        redis (RedisCache): Redis connection
+        cache_key (str): Recipe list key (e.g. "recipes:diet:keto")
+        page (int): Page number (1-based)
+        page_size (int): Items per page
+        total_count (int): Length of the cached list
+        
+    Returns:
+        bytes or None: Serialized JSON list of the page's recipes, or None if
+                       the pre-sliced pages are missing (caller reads the list)
+    """
+    start_idx = (page - 1) * page_size
+    end_idx = min(start_idx + page_size, total_count)
+    if start_idx >= end_idx:
+        return b"[]"
+    
+    first, last = start_idx // BASE_PAGE_SIZE, (end_idx - 1) // BASE_PAGE_SIZE
+    pages = redis.mget(
+        [f"{cache_key}:page:{n + 1}:{BASE_PAGE_SIZE}" for n in range(first, last + 1)],
+        raw=True
+    )
+    if not all(pages):
+        return None
+    
+    recipes = [recipe for page_json in pages for recipe in json_utils.loads(page_json)]
+    offset = start_idx - first * BASE_PAGE_SIZE
+    return json_utils.dumps(recipes[offset:offset + end_idx - start_idx])
+
+
 # ===== UTILITY FUNCTIONS =====
-def success_response(data):
-    """Helper function to return successful HTTP response"""
+# (whole second, formatted timestamp) of the last utc_now_iso() call
+_last_timestamp = (None, "")
+
+
+def utc_now_iso():
+    """Current UTC time as YYYY-MM-DDTHH:MM:SSZ, formatted at most once per second"""
+    global _last_timestamp
+    now = int(time.time())
+    if _last_timestamp[0] != now:
+        _last_timestamp = (now, time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now)))
+    return _last_timestamp[1]
+
+
+# Cached data only changes when BlobTrigger runs: let clients/CDNs reuse responses
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+
+def success_response(data, etag=None):
+    """Helper function to return successful HTTP response (cacheable if etag is given)"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL} if etag else None
     return func.HttpResponse(
-        json.dumps(data, ensure_ascii=False),
+        json_utils.dumps(data),
         status_code=200,
         mimetype="application/json; charset=utf-8",
+        headers=headers,
+    )
+
+
+# Per-instance memo of data read from Redis, keyed by response name. An entry
+# stays valid while metadata:last_processed is unchanged (until BlobTrigger runs)
+_MEMO = {}
+
+
+def get_memoized(name, version):
+    """Value memoized for this dataset version, or None"""
+    entry = _MEMO.get(name)
+    if version and entry and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def memoize(name, version, value):
+    """Remember value for the dataset version (no-op if the version is unknown)"""
+    if version:
+        _MEMO[name] = (version, value)
+
+
+def encode_trigger_performance(metadata):
+    """
+    Pre-encoded "blob_trigger_performance" section of the charts/insights
+    responses: a copy of metadata fields, constant until BlobTrigger runs again
+    """
+    return json_utils.Fragment(json_utils.dumps({
+        "last_processed": metadata.get("last_processed", "Unknown"),
+        "step_times": metadata.get("step_times", {}),
+        "total_recipes_processed": metadata.get("total_recipes", 0)
+    }))
+
+
+def make_etag(metadata, *parts):
+    """
+    Weak ETag for a cached response: the BlobTrigger run that produced the
+    data (metadata["last_processed"]) plus the request parameters selecting it
+    """
+    key = "|".join(str(part) for part in (metadata.get("last_processed", "0"), *parts))
+    return f'W/"{zlib.crc32(key.encode("utf-8")):08x}"'
+
+
+def etag_matches(req, etag):
+    """True if the client's If-None-Match already holds this ETag (weak comparison)"""
+    if_none_match = req.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified_response(etag):
+    """Helper function to return 304 Not Modified (no body, nothing serialized)"""
+    return func.HttpResponse(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
     )
 
 
 def error_response(message, status_code):
     """Helper function to return error HTTP response"""
     return func.HttpResponse(
-        json.dumps({
+        json_utils.dumps({
             "status": "error",
             "message": message,
-            "timestamp": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        }, ensure_ascii=False),
+            "timestamp": utc_now_iso()
+        }),
         status_code=status_code,
         mimetype="application/json; charset=utf-8",
     )
+
+
+# Action → handler, looked up once per request by main()
+ROUTES = {
+    'health': get_health,
+    'get-charts': get_charts,
+    'get-chart-image': get_chart_image,
+    'get-insights': get_insights,
+    'get-recipes': get_recipes,
+}
@@ -1,29 +1,179 @@
 """
 Chart Generator Module
-Convert matplotlib charts to Base64 encoding for direct use in HTML <img> tags
+Render matplotlib charts to PNG bytes, served directly as images or
+Base64 encoded for use in HTML <img> data URIs
 This module handles the visualization of nutritional insights data
 """
 
 import pandas as pd
+import matplotlib
+# 'Agg' backend - suitable for server environments without display.
+# Selected once at import, before pyplot loads, instead of per instance
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
+from PIL import Image, features
 import base64
+import functools
+import hashlib
 import io
+import os
+import logging
+from collections import OrderedDict
+
+try:
+    import pybase64
+except ImportError:  # SIMD encoder not installed: standard library base64
+    pybase64 = None
+
+logger = logging.getLogger(__name__)
+
+# Pillow (a matplotlib dependency) may be built without libwebp
+WEBP_SUPPORTED = features.check("webp")
+
+# zlib level for PNG output: 1 saves ~30% of the encode time of the default 6
+# for ~20% larger files; set CHART_PNG_LEVEL=6 (or 9) to favour size instead
+PNG_COMPRESS_LEVEL = int(os.environ.get("CHART_PNG_LEVEL", 1))
+
+
+def b64encode_text(data):
+    """Base64-encode bytes to str (pybase64 SIMD encoder, ~25x faster, if installed)"""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
+def frame_digest(df):
+    """
+    Content hash of a DataFrame (values, index and column labels)
+    
+    Args:
+        df (pandas.DataFrame): Chart input data
+        
+    Returns:
+        str: 32-character hex digest, equal for frames with equal content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(df.columns), df.index.names)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# Rendered charts kept per ChartGenerator instance (least recently used evicted)
+CHART_CACHE_SIZE = 32
+
+def memoized_chart(generate):
+    """
+    Cache a chart method's PNG by the content of its DataFrame argument.
+    Charts are pure functions of their data, so a re-upload whose aggregates
+    did not change (e.g. the same file again) reuses the PNGs instead of
+    re-rendering them (~100ms each).
+    """
+    @functools.wraps(generate)
+    def wrapper(self, df):
+        key = (generate.__name__, frame_digest(df))
+        png_bytes = self._png_cache.get(key)
+        if png_bytes is not None:
+            self._png_cache.move_to_end(key)
+            logger.info(f"{generate.__name__}: data unchanged, reusing rendered chart")
+            return png_bytes
+        
+        png_bytes = generate(self, df)
+        self._png_cache[key] = png_bytes
+        if len(self._png_cache) > CHART_CACHE_SIZE:
+            self._png_cache.popitem(last=False)
+        return png_bytes
+    return wrapper
 
 
 class ChartGenerator:
     """
     ChartGenerator class for creating and encoding nutritional insight visualizations.
     Generates bar charts, heatmaps, and scatter plots from nutritional data.
+    Figures are standalone Figure objects, not registered with pyplot's global
+    figure manager, so each chart keeps no shared state. A new Figure per chart
+    (~4ms) is also cheaper than clearing a pooled one for reuse (~6-8ms).
     """
     
     def __init__(self):
         """
         Initialize the chart generator.
-        Set up matplotlib backend for server environment (no display needed).
+        The matplotlib backend (Agg, no display needed) is set at module import,
+        so instances are cheap; one is shared per process so that its cache of
+        rendered charts survives between invocations.
+        Logs which deflate library Pillow (matplotlib's PNG writer) is built with.
         """
-        # Use 'Agg' backend - suitable for server environments without display
-        plt.switch_backend('Agg')
+        # (method name, frame_digest of its input) -> PNG bytes
+        self._png_cache = OrderedDict()
+        
+        # Pillow >= 11 wheels bundle zlib-ng, ~2x faster PNG deflate than zlib
+        if "zlib_ng" in features.features and features.check_feature("zlib_ng"):
+            logger.info(f"PNG deflate: zlib-ng {features.version_feature('zlib_ng')}")
+        else:
+            logger.warning(f"PNG deflate: zlib {features.version('zlib')} "
+                           "(install Pillow>=11 wheels for zlib-ng)")
+    
+    @staticmethod
+    def fig_to_png(fig):
+        """
+        Render matplotlib figure to PNG bytes.
+        The raw bytes can be served directly as an image/png response.
+        
+        Args:
+            fig (matplotlib.figure.Figure): The matplotlib figure object to render
+            
+        Returns:
+            bytes: PNG image data
+        """
+        # Create in-memory buffer for image
+        img_buffer = io.BytesIO()
+        # Save figure to buffer as PNG
+        # (Agg rasterizes every artist anyway: set_rasterized() on markers or
+        # heatmap cells only matters for vector formats and gives identical PNGs)
+        # bbox_inches='tight' costs an extra layout draw, but fig.tight_layout()
+        # needs the same measuring draw (no faster) and uncropped output is larger
+        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight',
+                    pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
+        # Close the figure to free memory (no-op for figures created without pyplot)
+        plt.close(fig)
+        return img_buffer.getvalue()
+    
+    @staticmethod
+    def png_to_base64(png_bytes):
+        """
+        Encode PNG bytes as a Base64 string (for data URIs).
+        
+        Args:
+            png_bytes (bytes): PNG image data
+            
+        Returns:
+            str: Base64 encoded PNG image string
+        """
+        return b64encode_text(png_bytes)
+    
+    @staticmethod
+    def png_to_data_uri(png_bytes):
+        """
+        Encode a PNG chart as a data URI for HTML <img> tags.
+        The chart is re-encoded as lossless WebP when Pillow supports it: the
+        same pixels in 2.5-3.5x fewer bytes than the PNG, at ~60ms per chart
+        (transcoding the PNG, not re-rendering the figure).
+        
+        Args:
+            png_bytes (bytes): PNG image data
+            
+        Returns:
+            str: "data:image/webp;base64,..." (or "data:image/png;base64,..."
+                 without WebP support)
+        """
+        if not WEBP_SUPPORTED:
+            return "data:image/png;base64," + ChartGenerator.png_to_base64(png_bytes)
+        
+        webp_buffer = io.BytesIO()
+        with Image.open(io.BytesIO(png_bytes)) as image:
+            image.save(webp_buffer, format="WEBP", lossless=True, quality=80, method=4)
+        return "data:image/webp;base64," + b64encode_text(webp_buffer.getvalue())
     
     @staticmethod
     def fig_to_base64(fig):
@@ -41,18 +191,9 @@ class ChartGenerator:
             >>> base64_image = ChartGenerator.fig_to_base64(fig)
             >>> html_img = f'<img src="data:image/png;base64,{base64_image}">'
         """
-        # Create in-memory buffer for image
-        img_buffer = io.BytesIO()
-        # Save figure to buffer as PNG
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
-        # Reset buffer position to beginning for reading
-        img_buffer.seek(0)
-        # Encode buffer content to Base64
-        img_base64 = base64.b64encode(img_buffer.read()).decode()
-        # Close the figure to free memory
-        plt.close(fig)
-        return img_base64
+        return ChartGenerator.png_to_base64(ChartGenerator.fig_to_png(fig))
     
+    @memoized_chart
     def generate_bar_chart(self, avg_macros):
         """
         Generate a bar chart showing average macronutrients by diet type.
@@ -63,7 +204,7 @@ class ChartGenerator:
                                           and columns for Protein(g), Carbs(g), Fat(g)
             
         Returns:
-            str: Base64 encoded PNG image of the bar chart
+            bytes: PNG image of the bar chart
             
         Raises:
             Exception: If chart generation fails
@@ -81,7 +222,8 @@ class ChartGenerator:
             )
             
             # Create figure and axis
-            fig, ax = plt.subplots(figsize=(12, 6))
+            fig = Figure(figsize=(12, 6))
+            ax = fig.subplots()
             # Plot bar chart with different colors for each macronutrient
             sns.barplot(data=avg_long, 
                        x="Diet_type", 
@@ -100,12 +242,13 @@ class ChartGenerator:
             # Add grid for better readability
             ax.grid(axis='y', alpha=0.3)
             
-            # Convert figure to Base64 and return
-            return self.fig_to_base64(fig)
+            # Render figure to PNG bytes and return
+            return self.fig_to_png(fig)
             
         except Exception as e:
             raise Exception(f"Error generating bar chart: {str(e)}")
     
+    @memoized_chart
     def generate_heatmap(self, avg_macros):
         """
         Generate a heatmap showing macronutrient correlations by diet type.
@@ -116,14 +259,15 @@ class ChartGenerator:
                                           and macronutrient columns
             
         Returns:
-            str: Base64 encoded PNG image of the heatmap
+            bytes: PNG image of the heatmap
             
         Raises:
             Exception: If heatmap generation fails
         """
         try:
             # Create figure and axis for heatmap
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig = Figure(figsize=(10, 6))
+            ax = fig.subplots()
             
             # Create heatmap with annotations showing values
             sns.heatmap(avg_macros, 
@@ -140,12 +284,13 @@ class ChartGenerator:
             ax.set_ylabel('Diet Type', fontsize=12)
             ax.set_xlabel('Macronutrient', fontsize=12)
             
-            # Convert figure to Base64 and return
-            return self.fig_to_base64(fig)
+            # Render figure to PNG bytes and return
+            return self.fig_to_png(fig)
             
         except Exception as e:
             raise Exception(f"Error generating heatmap: {str(e)}")
     
+    @memoized_chart
     def generate_scatter_plot(self, top5_protein_recipes):
         """
         Generate a scatter plot of top 5 protein-rich recipes by cuisine and diet type.
@@ -156,14 +301,15 @@ class ChartGenerator:
                                                      with columns: Cuisine_type, Protein(g), Diet_type
             
         Returns:
-            str: Base64 encoded PNG image of the scatter plot
+            bytes: PNG image of the scatter plot
             
         Raises:
             Exception: If scatter plot generation fails
         """
         try:
             # Create figure and axis for scatter plot
-            fig, ax = plt.subplots(figsize=(13, 7))
+            fig = Figure(figsize=(13, 7))
+            ax = fig.subplots()
             
             # Create scatter plot with multiple visual encodings
             sns.scatterplot(
@@ -191,8 +337,8 @@ class ChartGenerator:
             # Rotate x-axis labels for better readability
             ax.tick_params(axis='x', rotation=45)
             
-            # Convert figure to Base64 and return
-            return self.fig_to_base64(fig)
+            # Render figure to PNG bytes and return
+            return self.fig_to_png(fig)
             
         except Exception as e:
             raise Exception(f"Error generating scatter plot: {str(e)}")
@@ -228,15 +374,15 @@ if __name__ == "__main__":
     
     # Generate and test bar chart
     bar_chart = gen.generate_bar_chart(avg_macros)
-    print(f"Bar chart Base64 length: {len(bar_chart)}")
+    print(f"Bar chart PNG size: {len(bar_chart)} bytes, Base64 length: {len(gen.png_to_base64(bar_chart))}")
     
     # Generate and test heatmap
     heatmap = gen.generate_heatmap(avg_macros)
-    print(f"Heatmap Base64 length: {len(heatmap)}")
+    print(f"Heatmap PNG size: {len(heatmap)} bytes")
     
     # Generate and test scatter plot
     top5 = df.sort_values('Protein(g)', ascending=False).head(5)
     scatter = gen.generate_scatter_plot(top5)
-    print(f"Scatter plot Base64 length: {len(scatter)}")
+    print(f"Scatter plot PNG size: {len(scatter)} bytes")
     
     print("Charts generated successfully!")
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+JSON Helper Module
+Fast JSON encoding/decoding for Redis payloads and HTTP responses
+
+Uses orjson when it is installed (native UTF-8 bytes, ~2x faster than stdlib json)
+and falls back to the standard library json module otherwise.
+"""
+
+try:
+    import orjson
+except ImportError:  # orjson wheel not available on this platform
+    orjson = None
+    import json
+
+
+if orjson is not None:
+    Fragment = orjson.Fragment
+else:
+    class Fragment:
+        """Already-serialized JSON that is embedded verbatim by dumps()"""
+
+        def __init__(self, contents):
+            self.contents = contents.encode("utf-8") if isinstance(contents, str) else contents
+
+
+def dumps(data):
+    """
+    Serialize data to JSON
+
+    Args:
+        data: JSON-serializable object, may contain Fragment values
+              (pre-serialized JSON copied into the output as-is)
+
+    Returns:
+        bytes: UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+
+    # stdlib json has no raw-JSON support: emit a placeholder string per
+    # fragment, then swap the pre-serialized bytes in after encoding.
+    # The default ensure_ascii=True output is pure ASCII, so it takes the
+    # encoder's fast path and encodes to bytes without a UTF-8 pass
+    fragments = []
+
+    def default(obj):
+        if isinstance(obj, Fragment):
+            fragments.append(obj.contents)
+            return f"\x00fragment:{len(fragments) - 1}\x00"
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    body = json.dumps(data, default=default).encode("ascii")
+    for i, contents in enumerate(fragments):
+        body = body.replace(b'"\\u0000fragment:%d\\u0000"' % i, contents, 1)
+    return body
+
+
+def loads(data):
+    """
+    Deserialize JSON
+
+    Args:
+        data (str or bytes): JSON document
+
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -4,11 +4,78 @@ Provides connection and operations for Azure Redis Cache
 """
 
 import os
+import socket
+import hashlib
 import redis
 import logging
 
+from shared import json_utils
+
+try:
+    import zstandard
+except ImportError:  # values are then stored uncompressed
+    zstandard = None
+
+try:
+    import blake3
+except ImportError:  # hashlib's BLAKE2b is used for content keys instead
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# Every zstd frame starts with this magic number, which no cached JSON, Base64
+# or PNG value does, so compressed values are recognised without a key suffix
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Smaller values are stored as-is: compression would not pay for itself
+COMPRESS_MIN_BYTES = 1024
+
+if zstandard is not None:
+    _compressor = zstandard.ZstdCompressor(level=3)
+    _decompressor = zstandard.ZstdDecompressor()
+
+
+def compress_value(value):
+    """
+    zstd-compress a large cache value before writing it to Redis
+    
+    Args:
+        value (str or bytes): Value to cache
+        
+    Returns:
+        bytes or str: Compressed frame, or the value unchanged if it is small
+                      or zstandard is not installed
+    """
+    data = value.encode("utf-8") if isinstance(value, str) else value
+    if zstandard is None or len(data) < COMPRESS_MIN_BYTES:
+        return value
+    return _compressor.compress(data)
+
+
+def decompress_value(value):
+    """
+    Undo compress_value() on a raw value read from Redis
+    
+    Args:
+        value (bytes or None): Raw cached value
+        
+    Returns:
+        bytes or None: Decompressed value (unchanged if it was not compressed)
+    """
+    if value and value.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Cached value is zstd-compressed but zstandard is not installed")
+        return _decompressor.decompress(value)
+    return value
+
+# Probe idle pooled connections well within Azure's ~10 minute idle timeout, so
+# warm workers keep reusing them instead of hitting a dropped socket (and a new
+# TLS handshake). redis-py already sets TCP_NODELAY on every connection
+KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)  # not all of them exist on every platform
+}
+
 class RedisCache:
     """
     Redis Cache wrapper for Azure Cache for Redis
@@ -29,20 +96,44 @@ class RedisCache:
         
         logger.info(f"Connecting to Redis: {redis_host}:{redis_port}")
         
-        self.client = redis.Redis(
+        # Connection pools: sockets (and their TLS sessions) are reused by every
+        # call on this instance instead of reconnecting per request
+        pool_options = dict(
             host=redis_host,
             port=redis_port,
             password=redis_password,
-            ssl=True,
-            decode_responses=True,
+            connection_class=redis.SSLConnection,
             socket_connect_timeout=5,
-            socket_timeout=5
+            socket_timeout=5,
+            socket_keepalive=True,
+            socket_keepalive_options=KEEPALIVE_OPTIONS,
+            max_connections=32
         )
+        self.pool = redis.ConnectionPool(decode_responses=True, **pool_options)
+        self.client = redis.Redis(connection_pool=self.pool)
+        
+        # Second client without response decoding, for payloads that are
+        # passed through to HTTP responses as-is
+        self.raw_pool = redis.ConnectionPool(decode_responses=False, **pool_options)
+        self.raw_client = redis.Redis(connection_pool=self.raw_pool)
         
         # Test connection
+        self.ping()
+    
+    def ping(self):
+        """
+        Check that Redis is reachable
+        
+        Returns:
+            bool: True if Redis answered
+            
+        Raises:
+            Exception: If the connection fails
+        """
         try:
             self.client.ping()
             logger.info("✓ Redis connection successful")
+            return True
         except Exception as e:
             logger.error(f"✗ Redis connection failed: {e}")
             raise
@@ -57,8 +148,36 @@ class RedisCache:
         Returns:
             str or None: Cached value if exists, None if not found or error
         """
+        value = self.get_bytes(key)
+        return value.decode("utf-8") if value is not None else None
+    
+    def get_json(self, key):
+        """
+        Get a JSON value from Redis by key and parse it
+        The raw bytes go straight to the parser (orjson reads UTF-8 bytes),
+        without decoding them to str first.
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            Parsed value, or None if not found or error
+        """
+        value = self.get_bytes(key)
+        return json_utils.loads(value) if value else None
+    
+    def get_bytes(self, key):
+        """
+        Get raw (undecoded) value from Redis by key, decompressed if needed
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            bytes or None: Cached value if exists, None if not found or error
+        """
         try:
-            value = self.client.get(key)
+            value = decompress_value(self.raw_client.get(key))
             if value:
                 logger.info(f"✓ Cache HIT: {key}")
             else:
@@ -68,7 +187,7 @@ class RedisCache:
             logger.error(f"Redis GET error for key '{key}': {e}")
             return None
     
-    def set(self, key, value, ex=None):
+    def set(self, key, value, ex=None, compress=False):
         """
         Set value in Redis
         
@@ -76,11 +195,15 @@ class RedisCache:
             key (str): Cache key
             value (str): Value to cache
             ex (int, optional): Expiration time in seconds
+            compress (bool): zstd-compress large values (read back transparently
+                             by get/get_bytes/mget)
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
+            if compress:
+                value = compress_value(value)
             self.client.set(key, value, ex=ex)
             expiry_info = f" (expires in {ex}s)" if ex else " (no expiration)"
             logger.info(f"Cached: {key}{expiry_info}")
@@ -90,25 +213,162 @@ class RedisCache:
             return False
         
      
-    def keys(self, pattern="*"):
+    @staticmethod
+    def content_key(namespace, data):
+        """
+        Content-addressed cache key: equal inputs map to the same key, so a
+        value cached under it can be reused for an identical upload
+        
+        Args:
+            namespace (str): Key prefix (e.g. "insights")
+            data (bytes): Input the cached value was derived from
+            
+        Returns:
+            str: "<namespace>:<24 hex digits of BLAKE3 (or BLAKE2b) of data>"
+        """
+        if blake3 is not None:
+            digest = blake3.blake3(data).hexdigest()[:24]
+        else:
+            digest = hashlib.blake2b(data, digest_size=12).hexdigest()
+        return f"{namespace}:{digest}"
+    
+    def get_or_compute(self, key, producer, ex=3600, raw=False, compress=False):
+        """
+        Get a cached value, or compute and cache it on a miss
+        
+        Args:
+            key (str): Cache key (should identify the inputs of producer)
+            producer (callable): Called without arguments to build the value
+            ex (int, optional): Expiration time in seconds of a computed value
+            raw (bool): Read the value as bytes (for binary values such as PNGs)
+            compress (bool): zstd-compress the computed value when storing it
+            
+        Returns:
+            str or bytes: Cached or freshly computed value
+        """
+        value = self.get_bytes(key) if raw else self.get(key)
+        if value is None:
+            value = producer()
+            self.set(key, value, ex=ex, compress=compress)
+        return value
+    
+    def keys(self, pattern="*", count=500):
         """
         Get all keys matching pattern
+        Iterates with SCAN rather than KEYS, which blocks every other client
+        while it walks the whole keyspace.
         
         Args:
             pattern (str): Key pattern (default: "*" for all keys)
+            count (int): Keys examined per SCAN call
             
         Returns:
             list: List of matching keys
         """
         try:
-            return self.client.keys(pattern)
+            return list(self.client.scan_iter(match=pattern, count=count))
         except Exception as e:
-            logger.error(f"Redis KEYS error for pattern '{pattern}': {e}")
+            logger.error(f"Redis SCAN error for pattern '{pattern}': {e}")
             return []
         
+    def dbsize(self):
+        """
+        Count the keys in the database (O(1), unlike listing them with keys())
+        
+        Returns:
+            int: Number of keys, or 0 on error
+        """
+        try:
+            return self.client.dbsize()
+        except Exception as e:
+            logger.error(f"Redis DBSIZE error: {e}")
+            return 0
+        
+    def mget(self, keys, raw=False):
+        """
+        Get several values in a single round-trip, decompressed if needed
+        
+        Args:
+            keys (list): Cache keys
+            raw (bool): Return undecoded bytes instead of str
+            
+        Returns:
+            list: Cached values in key order (None for missing keys or on error)
+        """
+        try:
+            values = [decompress_value(value) for value in self.raw_client.mget(keys)]
+            if raw:
+                return values
+            return [value.decode("utf-8") if value is not None else None for value in values]
+        except Exception as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+    
+    def sunion(self, keys):
+        """
+        Union of several sets
+        
+        Args:
+            keys (list): Set keys
+            
+        Returns:
+            set: Members present in any of the sets (empty on error)
+        """
+        try:
+            return self.client.sunion(keys)
+        except Exception as e:
+            logger.error(f"Redis SUNION error for {len(keys)} keys: {e}")
+            return set()
+    
+    def smismember(self, key, members):
+        """
+        Check membership of several values in one set
+        
+        Args:
+            key (str): Set key
+            members (list): Values to check
+            
+        Returns:
+            list: True/False per member, in order (all False on error)
+        """
+        try:
+            return [bool(flag) for flag in self.client.smismember(key, members)]
+        except Exception as e:
+            logger.error(f"Redis SMISMEMBER error for key '{key}': {e}")
+            return [False] * len(members)
+    
+    def sscan(self, key, match=None, count=5000):
+        """
+        Iterate set members matching a glob pattern (server-side filtering)
+        
+        Args:
+            key (str): Set key
+            match (str, optional): Glob pattern, e.g. "*chick*"
+            count (int): Members examined per SSCAN call
+            
+        Returns:
+            list: Matching members (empty on error)
+        """
+        try:
+            return list(self.client.sscan_iter(key, match=match, count=count))
+        except Exception as e:
+            logger.error(f"Redis SSCAN error for key '{key}': {e}")
+            return []
+    
+    def pipeline(self):
+        """
+        Create a non-transactional pipeline for batching commands
+        Commands are buffered and sent in one round-trip on execute()
+        
+        Returns:
+            redis.client.Pipeline: Pipeline on the decoded client
+        """
+        return self.client.pipeline(transaction=False)
+    
     # Note:
     # The following methods are not currently used but are provided for completeness.
     # Keep them here for potential future use.
+    # (exists() is used by the search index fallback check)
     def delete(self, key):
         """
         Delete key from Redis
@@ -157,3 +417,22 @@ class RedisCache:
         except Exception as e:
             logger.error(f"Redis FLUSHALL error: {e}")
             return False
+
+
+# Process-wide instance, see get_redis_cache()
+_shared_cache = None
+
+
+def get_redis_cache():
+    """
+    Get the process-wide RedisCache, creating it on first use
+    Azure Functions reuses the worker process across invocations, so the
+    connection pools (and their open connections) survive between requests.
+    
+    Returns:
+        RedisCache: Shared Redis cache instance
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RedisCache()
+    return _shared_cache
@@ -0,0 +1,149 @@
+"""
+Recipe Search Index Module
+Inverted index over recipe names, stored in Redis
+
+BlobTrigger builds the index once per file change; the API uses it to
+answer keyword searches without decoding and scanning whole recipe lists.
+
+Keys:
+  - recipe:<id>              JSON of a single recipe
+  - recipe_idx:tok:<token>   Set of IDs of recipes whose name contains the token
+  - recipe_idx:tokens        Set of all indexed tokens (searched with SSCAN MATCH)
+  - <list key>:ids           Set of recipe IDs in a cached list (written by BlobTrigger)
+"""
+
+import re
+import logging
+
+from shared import json_utils
+
+logger = logging.getLogger(__name__)
+
+TOKENS_KEY = "recipe_idx:tokens"
+
+# Recipe names are indexed by their lowercase ASCII alphanumeric runs
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize_recipe_name(name):
+    """
+    Split a recipe name (or search keyword) into lowercase search tokens.
+    Anything that is not an ASCII letter or digit acts as a separator.
+
+    Args:
+        name (str): Recipe name or keyword
+
+    Returns:
+        list: Tokens in order of appearance, e.g. "Keto Chicken-Salad" ->
+              ["keto", "chicken", "salad"]
+    """
+    return TOKEN_PATTERN.findall(str(name).lower())
+
+
+def build_search_index(redis, recipe_ids, recipes):
+    """
+    Build the inverted index used by the API keyword search
+    Replaces the index of the previously processed dataset.
+
+    Args:
+        redis (RedisCache): Redis connection
+        recipe_ids (list): Recipe IDs (row index in the cleaned data)
+        recipes (list): Recipe dictionaries, same order as recipe_ids
+
+    Returns:
+        int: Number of distinct tokens indexed
+    """
+    token_index = {}
+    for recipe_id, recipe in zip(recipe_ids, recipes):
+        for token in set(tokenize_recipe_name(recipe["recipe_name"])):
+            token_index.setdefault(token, []).append(recipe_id)
+
+    # Drop token sets left over from the previous dataset
+    stale_tokens = redis.sscan(TOKENS_KEY)
+
+    # Thousands of small writes: send them in one pipelined batch
+    pipe = redis.pipeline()
+    for token in stale_tokens:
+        pipe.delete(f"recipe_idx:tok:{token}")
+    pipe.delete(TOKENS_KEY)
+
+    for recipe_id, recipe in zip(recipe_ids, recipes):
+        pipe.set(f"recipe:{recipe_id}", json_utils.dumps(recipe))
+
+    for token, ids in token_index.items():
+        pipe.sadd(f"recipe_idx:tok:{token}", *ids)
+    if token_index:
+        pipe.sadd(TOKENS_KEY, *token_index)
+    pipe.execute()
+
+    logger.info(f"Search index built: {len(recipe_ids)} recipes, {len(token_index)} tokens")
+    return len(token_index)
+
+
+def search_recipes(redis, keyword, cache_key, page, page_size):
+    """
+    Find recipes whose name contains the keyword (case-insensitive substring,
+    same semantics as scanning the list) using the inverted index.
+
+    Every keyword token must be a substring of some name token, so candidate
+    IDs are the intersection over keyword tokens of the union of matching
+    token sets. A single-token keyword makes the candidates exact and only the
+    requested page is fetched; otherwise candidates are re-checked against the
+    full keyword (spaces/punctuation) before paginating.
+
+    Args:
+        redis (RedisCache): Redis connection
+        keyword (str): Search keyword
+        cache_key (str): Recipe list being searched (e.g. "recipes:diet:keto")
+        page (int): Page number (1-based)
+        page_size (int): Items per page
+
+    Returns:
+        tuple or None: (total_count, page_json) with page_json the serialized JSON
+                       list of recipes on the page, or None if the keyword has no
+                       indexable tokens or the index is missing (caller falls
+                       back to scanning the list)
+    """
+    tokens = set(tokenize_recipe_name(keyword))
+    if not tokens:
+        return None
+
+    candidate_ids = None
+    for token in tokens:
+        matching_tokens = redis.sscan(TOKENS_KEY, match=f"*{token}*")
+        token_ids = (
+            redis.sunion([f"recipe_idx:tok:{t}" for t in matching_tokens])
+            if matching_tokens else set()
+        )
+        candidate_ids = token_ids if candidate_ids is None else candidate_ids & token_ids
+        if not candidate_ids:
+            # No index at all (data processed before it existed): let the caller scan
+            if not redis.exists(TOKENS_KEY):
+                logger.warning("Search index not found - falling back to list scan")
+                return None
+            return 0, b"[]"
+
+    candidate_ids = list(candidate_ids)
+
+    # Keep only recipes in the selected diet/cuisine list
+    if cache_key != "recipes:all":
+        in_list = redis.smismember(f"{cache_key}:ids", candidate_ids)
+        candidate_ids = [recipe_id for recipe_id, keep in zip(candidate_ids, in_list) if keep]
+
+    # Recipe IDs are row positions: sorting restores the cached list order
+    candidate_ids.sort(key=int)
+    start_idx = (page - 1) * page_size
+    keyword_lower = keyword.lower()
+
+    if TOKEN_PATTERN.fullmatch(keyword_lower):
+        page_ids = candidate_ids[start_idx:start_idx + page_size]
+        page_recipes = redis.mget([f"recipe:{i}" for i in page_ids]) if page_ids else []
+        page_json = "[" + ",".join(r for r in page_recipes if r) + "]"
+        return len(candidate_ids), page_json
+
+    candidates = redis.mget([f"recipe:{i}" for i in candidate_ids]) if candidate_ids else []
+    matches = [
+        recipe for recipe in (json_utils.loads(raw) for raw in candidates if raw)
+        if keyword_lower in recipe.get("recipe_name", "").lower()
+    ]
+    return len(matches), json_utils.dumps(matches[start_idx:start_idx + page_size])
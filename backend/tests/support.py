@@ -0,0 +1,58 @@
+"""
+Shared test helpers: import path setup and an in-memory Redis
+
+Run from backend/:  python -m unittest discover -s tests
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = BACKEND_DIR.parent
+DATA_PATH = REPO_DIR / "data" / "All_Diets.csv"
+
+# backend/ for the Functions modules, the repository root for api_server
+for path in (BACKEND_DIR, REPO_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+class FakeBlob:
+    """Stand-in for func.InputStream as passed to the BlobTrigger"""
+
+    def __init__(self, data, name="datasets/All_Diets.csv"):
+        self.data = data
+        self.name = name
+        self.length = len(data)
+
+    def read(self):
+        return self.data
+
+
+def make_fake_redis_cache():
+    """
+    Build a RedisCache backed by fakeredis and make it the process-wide
+    instance returned by get_redis_cache() in the Functions modules
+
+    Returns:
+        RedisCache: Cache over an empty in-memory server
+    """
+    import fakeredis
+    from shared import redis_cache
+    import Api
+    import BlobTrigger
+
+    server = fakeredis.FakeServer()
+    cache = object.__new__(redis_cache.RedisCache)
+    cache.client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    cache.raw_client = fakeredis.FakeRedis(server=server, decode_responses=False)
+
+    redis_cache._shared_cache = cache
+    Api.get_redis_cache = lambda: cache
+    BlobTrigger.get_redis_cache = lambda: cache
+    # Memoized responses are keyed by the (per-second) processing time,
+    # which two uploads in one test can share
+    Api._MEMO.clear()
+    logging.disable(logging.CRITICAL)
+    return cache
@@ -0,0 +1,173 @@
+"""
+Schema of the insights responses, whose bodies are spliced together from
+pre-encoded bytes: they must parse as plain JSON with the same keys (and
+values) as the dicts they replaced, with orjson and with the stdlib fallback
+"""
+
+import importlib
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import support
+
+import azure.functions as func
+
+
+def parse(body):
+    """Parse a response body with json and orjson, rejecting duplicate keys"""
+    def no_duplicates(pairs):
+        keys = [key for key, _ in pairs]
+        assert len(keys) == len(set(keys)), f"duplicate keys: {keys}"
+        return dict(pairs)
+
+    data = json.loads(body, object_pairs_hook=no_duplicates)
+    try:
+        import orjson
+    except ImportError:
+        return data
+    assert orjson.loads(body) == data
+    return data
+
+
+def roundtrip(value):
+    """value as a client sees it after JSON encoding"""
+    return json.loads(json.dumps(value))
+
+
+class JsonUtilsFragmentTest(unittest.TestCase):
+
+    def check_dumps(self, json_utils):
+        inner = json_utils.dumps({"a": [1, 2.5, "x\u00e9"], "b": None})
+        body = json_utils.dumps({
+            "first": json_utils.Fragment(inner),
+            "list": [json_utils.Fragment(b"[1,2]"), json_utils.Fragment("{}")],
+        })
+        self.assertIsInstance(body, bytes)
+        self.assertEqual(parse(body), {
+            "first": {"a": [1, 2.5, "x\u00e9"], "b": None},
+            "list": [[1, 2], {}],
+        })
+
+    def test_orjson(self):
+        from shared import json_utils
+        if json_utils.orjson is None:
+            self.skipTest("orjson not installed")
+        self.check_dumps(json_utils)
+
+    def test_stdlib_fallback(self):
+        from shared import json_utils
+        try:
+            with mock.patch.dict(sys.modules, {"orjson": None}):
+                importlib.reload(json_utils)
+            self.assertIsNone(json_utils.orjson)
+            self.check_dumps(json_utils)
+        finally:
+            importlib.reload(json_utils)
+
+
+class AzureInsightsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import BlobTrigger
+
+        cls.redis = support.make_fake_redis_cache()
+        BlobTrigger.main(support.FakeBlob(support.DATA_PATH.read_bytes()))
+
+    def get_insights(self):
+        import Api
+
+        Api._MEMO.clear()
+        req = func.HttpRequest(
+            "GET", "http://localhost/api/get-insights",
+            route_params={"action": "get-insights"}, body=b""
+        )
+        response = Api.main(req)
+        self.assertEqual(response.status_code, 200)
+        return parse(response.get_body())
+
+    def check_body(self, body):
+        metadata = json.loads(self.redis.get("metadata"))
+        self.assertEqual(set(body), {
+            "status", "data", "api_performance", "blob_trigger_performance",
+            "performance_comparison", "message"
+        })
+        self.assertEqual(body["data"], {
+            "insights": json.loads(self.redis.get("insights:summary")),
+            "data_stats": {
+                "total_recipes": metadata.get("total_recipes", 0),
+                "diet_types": metadata.get("diet_types_count", 0),
+                "cuisines": metadata.get("cuisines_count", 0)
+            }
+        })
+        self.assertEqual(body["blob_trigger_performance"], {
+            "last_processed": metadata.get("last_processed", "Unknown"),
+            "step_times": metadata.get("step_times", {}),
+            "total_recipes_processed": metadata.get("total_recipes", 0)
+        })
+
+    def test_orjson_body(self):
+        self.check_body(self.get_insights())
+
+    def test_stdlib_fallback_body(self):
+        from shared import json_utils
+        try:
+            with mock.patch.dict(sys.modules, {"orjson": None}):
+                importlib.reload(json_utils)
+            self.check_body(self.get_insights())
+        finally:
+            importlib.reload(json_utils)
+
+
+class FlaskInsightsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import api_server
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.patches = [
+            mock.patch.object(api_server, "DATA_PATH", str(support.DATA_PATH)),
+            mock.patch.object(api_server, "PARQUET_PATH", str(Path(cls.tmp.name) / "All_Diets.parquet")),
+        ]
+        for patch in cls.patches:
+            patch.start()
+        cls.api_server = api_server
+        cls.client = api_server.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        for patch in cls.patches:
+            patch.stop()
+        cls.tmp.cleanup()
+
+    def check_body(self):
+        api_server = self.api_server
+        api_server._DATA_CACHE['derived'].clear()
+        response = self.client.get("/api/insights")
+        self.assertEqual(response.status_code, 200)
+        body = parse(response.get_data())
+
+        summary = roundtrip(api_server.summarize_dataset(api_server.load_and_process_data()))
+        self.assertEqual(set(body), set(summary) | {"protein_carbs_scatter", "processing_status"})
+        self.assertEqual({key: body[key] for key in summary}, summary)
+        self.assertEqual(body["processing_status"], "success")
+        for diet_data in body["protein_carbs_scatter"]:
+            self.assertEqual(set(diet_data), {"diet_type", "data"})
+
+    def test_orjson_body(self):
+        if self.api_server.orjson is None:
+            self.skipTest("orjson not installed")
+        self.check_body()
+
+    def test_stdlib_fallback_body(self):
+        with mock.patch.object(self.api_server, "orjson", None):
+            self.check_body()
+
+
+if __name__ == "__main__":
+    unittest.main()
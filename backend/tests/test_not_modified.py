@@ -0,0 +1,61 @@
+"""
+Conditional requests (If-None-Match) against the Functions API
+"""
+
+import unittest
+
+import support
+
+import azure.functions as func
+
+
+def call(action, headers=None, **params):
+    """Call /api/<action>, return the HttpResponse"""
+    import Api
+
+    req = func.HttpRequest(
+        "GET", f"http://localhost/api/{action}",
+        params={key: str(value) for key, value in params.items()},
+        headers=headers or {},
+        route_params={"action": action},
+        body=b""
+    )
+    return Api.main(req)
+
+
+class EmptyCacheTest(unittest.TestCase):
+    """Nothing processed yet: no endpoint may answer 304"""
+
+    def setUp(self):
+        support.make_fake_redis_cache()
+
+    def test_wildcard_if_none_match_is_not_answered_with_304(self):
+        for action in ("get-recipes", "get-insights", "get-charts"):
+            with self.subTest(action=action):
+                response = call(action, headers={"If-None-Match": "*"})
+                self.assertEqual(response.status_code, 503)
+                self.assertNotIn("ETag", response.headers)
+
+
+class ProcessedCacheTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import BlobTrigger
+
+        support.make_fake_redis_cache()
+        BlobTrigger.main(support.FakeBlob(support.DATA_PATH.read_bytes()))
+
+    def test_current_etag_gives_304(self):
+        for action, params in (("get-recipes", {"diet_type": "vegan"}), ("get-insights", {})):
+            with self.subTest(action=action):
+                response = call(action, **params)
+                self.assertEqual(response.status_code, 200)
+                etag = response.headers["ETag"]
+
+                response = call(action, headers={"If-None-Match": etag}, **params)
+                self.assertEqual(response.status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Re-uploading All_Diets.csv: nothing cached for the previous dataset may leak
+into the responses for the new one
+"""
+
+import json
+import unittest
+
+import support
+
+import azure.functions as func
+
+
+def get_recipes(**params):
+    """Call /api/get-recipes, return (status code, parsed body)"""
+    import Api
+
+    req = func.HttpRequest(
+        "GET", "http://localhost/api/get-recipes",
+        params={key: str(value) for key, value in params.items()},
+        route_params={"action": "get-recipes"},
+        body=b""
+    )
+    response = Api.main(req)
+    return response.status_code, json.loads(response.get_body())
+
+
+class ReuploadTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import BlobTrigger
+
+        cls.redis = support.make_fake_redis_cache()
+        csv_data = support.DATA_PATH.read_bytes()
+        header, *rows = csv_data.decode("utf-8").splitlines(keepends=True)
+        cls.without_keto = (header + "".join(r for r in rows if not r.startswith("keto,"))).encode("utf-8")
+
+        BlobTrigger.main(support.FakeBlob(csv_data))
+        status, body = get_recipes(diet_type="keto", keyword="chicken")
+        cls.keto_hits_before = body["data"]["pagination"]["total_count"] if status == 200 else 0
+
+        BlobTrigger.main(support.FakeBlob(cls.without_keto))
+
+    def test_keyword_search_does_not_use_ids_of_removed_list(self):
+        self.assertGreater(self.keto_hits_before, 0)
+        self.assertFalse(self.redis.client.exists("recipes:diet:keto:ids"))
+
+        status, body = get_recipes(diet_type="keto", keyword="chicken")
+        if status == 200:
+            diets = {recipe["diet_type"] for recipe in body["data"]["recipes"]}
+            self.assertLessEqual(diets, {"keto"})
+        else:
+            self.assertEqual(status, 404)
+
+    def test_removed_list_is_not_served(self):
+        for key in ("recipes:diet:keto", "recipes:diet:keto:count", "recipes:diet:keto:page:1:20"):
+            self.assertFalse(self.redis.client.exists(key), key)
+        self.assertEqual(self.redis.keys("recipes:diet:keto:*"), [])
+
+        status, _ = get_recipes(diet_type="keto")
+        self.assertEqual(status, 404)
+
+    def test_current_lists_are_kept(self):
+        status, body = get_recipes(diet_type="vegan", page=2, page_size=20)
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body["data"]["recipes"]), 20)
+        status, body = get_recipes()
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            body["data"]["pagination"]["total_count"],
+            self.without_keto.count(b"\n") - 1
+        )
+
+    def test_pages_past_the_shorter_list_are_empty(self):
+        rows = self.without_keto.count(b"\n") - 1
+        status, body = get_recipes(page=rows // 20 + 2, page_size=20)
+        self.assertEqual(status, 200)
+        self.assertEqual(body["data"]["recipes"], [])
+        self.assertFalse(self.redis.client.exists(f"recipes:all:page:{rows // 20 + 2}:20"))
+
+    def test_keyword_search_still_matches_current_lists(self):
+        status, body = get_recipes(diet_type="mediterranean", keyword="chicken")
+        self.assertEqual(status, 200)
+        diets = {recipe["diet_type"] for recipe in body["data"]["recipes"]}
+        self.assertEqual(diets, {"mediterranean"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -104,6 +104,16 @@ export const fetchCharts = async () => {
   }
 };
 
+/**
+ * URL of a single chart served as a PNG image (cached by the browser)
+ * Use directly as an image source: <img src={getChartImageUrl('bar_chart')} />
+ *
+ * @param {string} name - 'bar_chart' | 'heatmap' | 'scatter_plot'
+ * @returns {string} Chart image URL
+ */
+export const getChartImageUrl = (name) =>
+  `${API_BASE_URL}/api/get-chart-image?name=${encodeURIComponent(name)}`;
+
 /**
  * Health check
  * Returns: {
@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for the Flask API server
+Run: gunicorn -c gunicorn_conf.py wsgi:application
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# gevent workers: each worker serves many concurrent connections
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gevent"
+worker_connections = 1000
+
+# Import the app (and load the dataset) in the master before forking workers
+preload_app = True
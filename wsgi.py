@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for the Flask API server
+Used by Gunicorn: gunicorn -c gunicorn_conf.py wsgi:application
+"""
+
+from api_server import app, load_and_process_data
+
+# Load the dataset at import time. With preload_app this runs once in the
+# Gunicorn master and the forked workers share the DataFrame copy-on-write.
+load_and_process_data()
+
+application = app